@@ -1,4 +1,12 @@
+import re
+from bisect import bisect_left
+
+import pandas as pd
+
 # ************************Convert to openpyxl*******************************
+_PERIOD_WEEK_RE = re.compile(r"Period\s*\d+\s*-\s*Week\s*(\d+)", re.IGNORECASE)
+_PERIOD_ENDS = (4, 9, 13, 17, 22, 26, 30, 35, 39, 43, 48)  # 4-5-4 pattern; period 12 ends at year end
+
 def add_next_period_week_column(df_listings: pd.DataFrame,
                                 is_53_week: bool = False,
                                 fill_value=pd.NA):
@@ -16,17 +24,13 @@ def add_next_period_week_column(df_listings: pd.DataFrame,
         (df_listings, new_col_name)
     """
     # 1) Extract week numbers from existing 'Period X- Week Y' columns
-    pattern = re.compile(r"Period\s*\d+\s*-\s*Week\s*(\d+)", flags=re.IGNORECASE)
-    weeks = []
-    for col in map(str, df_listings.columns):
-        m = pattern.search(col)
-        if m:
-            weeks.append(int(m.group(1)))
-
-    if not weeks:
+    last_week = max(
+        (int(m.group(1)) for col in map(str, df_listings.columns) if (m := _PERIOD_WEEK_RE.search(col))),
+        default=None,
+    )
+    if last_week is None:
         raise ValueError("No columns matching 'Period X- Week Y' were found.")
 
-    last_week = max(weeks)
     next_week = last_week + 1
 
     # 2) Determine allowable max week and 4-5-4 period boundaries
@@ -34,10 +38,8 @@ def add_next_period_week_column(df_listings: pd.DataFrame,
     if next_week > max_week_allowed:
         raise ValueError(f"Next week ({next_week}) exceeds the {max_week_allowed}-week fiscal year.")
 
-    period_ends = [4, 9, 13, 17, 22, 26, 30, 35, 39, 43, 48, max_week_allowed]  # 4-5-4 pattern
-
-    # 3) Map week -> period number
-    period = next(i + 1 for i, end in enumerate(period_ends) if next_week <= end)
+    # 3) Map week -> period number (first period whose end >= next_week)
+    period = bisect_left(_PERIOD_ENDS, next_week) + 1
 
     # 4) Add the new column
     new_col = f"Period {period}- Week {next_week}"